@@ -0,0 +1,70 @@
+"""
+Import-time benchmark of the openfc package.
+
+Measures the wall time of `python -c "import openfc"` in fresh interpreters, as paid by
+every short-lived sweep worker, and checks that heavy optional dependencies are not loaded.
+Exits with a non-zero status if the median import time exceeds the budget or a heavy module is imported.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 10] [--max-ms 1000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+HEAVY_MODULES = ['matplotlib', 'networkx', 'scipy']
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import openfc
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(m for m in sys.modules if '.' not in m)}))
+"""
+
+
+def measure(repeat):
+    """
+    Imports openfc in `repeat` fresh interpreters.
+
+    Returns:
+        tuple: The import times in milliseconds and the top-level modules loaded by the last run.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, os.environ.get('PYTHONPATH', '')]))
+    times = []
+    modules = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', SNIPPET], env=env, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        times.append(result['elapsed'] * 1000)
+        modules = result['modules']
+    return times, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10, help='Number of fresh interpreters')
+    parser.add_argument('--max-ms', type=float, default=1000, help='Budget for the median import time in ms')
+    args = parser.parse_args()
+
+    times, modules = measure(args.repeat)
+    median = statistics.median(times)
+    print(f"import openfc: median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms over {args.repeat} runs")
+
+    failed = False
+    heavy = [module for module in HEAVY_MODULES if module in modules]
+    if heavy:
+        print(f"FAIL: heavy modules imported with openfc: {', '.join(heavy)}")
+        failed = True
+    if median > args.max_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds the budget of {args.max_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,10 @@
 import sys
 import os
 
-# Add the root directory to sys.path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from src.openfc.components.fuelingSystem import FuelingSystem
-from src.openfc.components.component import Component
-from src.openfc.components.plasma import Plasma
-from src.openfc.components.breedingBlanket import BreedingBlanket
-from src.openfc.componentMap import ComponentMap
-from matplotlib import pyplot as plt
-from src.openfc.simulate import Simulate
-import numpy as np
-from src.openfc.tools.utils import visualize_connections
+# Add the source directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from openfc import BreedingBlanket, Component, ComponentMap, FuelingSystem, Plasma, Simulate, visualize_connections
 
 LAMBDA = 1.73e-9 # Decay constant for tritium
 AF = 0.7
@@ -153,8 +145,9 @@ component_map.connect_ports(fueling_system, port40, divertor, port42)
 # component_map.print_connected_map()
 # visualize_connections(component_map)
 print(f'Startup inventory is: {fueling_system.tritium_inventory}')
-simulation = Simulate(dt=0.01, dt_max = 1000, final_time=final_time, I_reserve=I_reserve, component_map=component_map, max_simulations=2)
+simulation = Simulate(dt=0.01, dt_max = 1000, final_time=final_time, I_reserve=I_reserve, component_map=component_map, max_simulations=2, store_flows=False)
 t, y = simulation.run()
+results = simulation.results()
 # np.savetxt('tritium_inventory.txt', [t,y], delimiter=',')
 
 combinations = [
@@ -163,13 +156,18 @@ combinations = [
     ('olive', '-'), ('c', '--'), ('navy', ':'), ('maroon', '-.')
 ]
 
+from matplotlib import pyplot as plt  # only needed for plotting
+
 fig,ax = plt.subplots()
-for i, (color, linestyle) in enumerate(combinations):
-    ax.loglog(t, np.array(y)[:,i], color=color, linestyle=linestyle)
+for name, (color, linestyle) in zip(results.component_names, combinations):
+    ax.loglog(results.time, results[name], color=color, linestyle=linestyle)
 # ax.loglog(t, y)
 ax.legend(component_map.components.keys())
 plt.show()
 print(f"Component inventories: {component_map.components.keys()}: {y[-1]}\n")
 
-for component in component_map.components.values():
-    print(f"Component: {component.name}, inflow: {component.inflow[-1]:.4f} kg/s, outflow: {component.outflow[-1]:.4f} kg/s")
+for name in results.component_names:
+    print(f"Component: {name}, inflow: {results.inflow(name)[-1]:.4f} kg/s, outflow: {results.outflow(name)[-1]:.4f} kg/s")
+
+print(f"Non-radioactive losses: {sum(results.cumulative_losses().values()):.4e} kg, decay: {sum(results.decay_totals().values()):.4e} kg")
+print(f"Time above reserve: {results.time_above_reserve() / results.time[-1] * 100:.1f}%")
@@ -0,0 +1,48 @@
+"""
+OpenFC: fusion fuel cycle model.
+
+Only numpy is imported with the package. Analysis modules that need scipy, and plotting
+tools that need networkx and matplotlib, are imported when first accessed.
+"""
+import importlib
+
+from openfc.port import Port
+from openfc.componentMap import ComponentMap
+from openfc.components import Component, BreedingBlanket, FuelingSystem, Plasma
+from openfc.simulate import Simulate
+from openfc.results import Results
+from openfc.streaming import Crossing, Downsample, Maximum, Minimum
+
+_LAZY_ATTRIBUTES = {
+    'UncertaintyQuantification': 'openfc.uncertainty',
+    'Surrogate': 'openfc.surrogate',
+    'DesignOptimizer': 'openfc.optimize',
+    'visualize_connections': 'openfc.tools.utils',
+}
+
+__all__ = [
+    'Port',
+    'ComponentMap',
+    'Component',
+    'BreedingBlanket',
+    'FuelingSystem',
+    'Plasma',
+    'Simulate',
+    'Results',
+    'Minimum',
+    'Maximum',
+    'Crossing',
+    'Downsample',
+] + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'openfc' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
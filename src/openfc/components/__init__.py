@@ -0,0 +1,4 @@
+from .component import Component
+from .breedingBlanket import BreedingBlanket
+from .fuelingSystem import FuelingSystem
+from .plasma import Plasma
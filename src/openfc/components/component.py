@@ -36,6 +36,7 @@ class Component:
         self.tritium_inventory = initial_inventory
         self.tritium_source = tritium_source
         self.non_radioactive_loss = non_radioactive_loss
+        self.unmet_removal = 0  # Tritium requested by remove_tritium but not available
         # self.AF = AF
         self.inflow = []
         self.outflow = []
@@ -109,6 +110,7 @@ class Component:
             return amount
         else:
             removed_amount = self.tritium_inventory
+            self.unmet_removal += amount - removed_amount
             self.tritium_inventory = 0
             return removed_amount
 
@@ -131,7 +133,54 @@ class Component:
         Returns:
             float: The outflow rate.
         """
-        return self.tritium_inventory / self.residence_time
+        return self.outflow_from_inventory(self.tritium_inventory)
+
+    def outflow_from_inventory(self, inventory):
+        """
+        Calculates the outflow rate for given inventory values. Works with scalars and numpy arrays.
+
+        Args:
+            inventory (float or array): The tritium inventory of the component.
+
+        Returns:
+            float or array: The outflow rate.
+        """
+        return inventory / self.residence_time
+
+    def loss_rates(self, inventory):
+        """
+        Calculates the rates at which tritium leaves or enters the fuel cycle for given inventory values.
+
+        Args:
+            inventory (float or array): The tritium inventory of the component.
+
+        Returns:
+            dict: The non-radioactive loss, decay, source and burn rates.
+        """
+        return {
+            'loss': self.outflow_from_inventory(inventory) * self.non_radioactive_loss,
+            'decay': inventory * LAMBDA,
+            'source': self.tritium_source,
+            'burn': 0.0,
+        }
+
+    def ledger_rates(self):
+        """
+        Calculates the current rates of the conservation ledger channels, from the same terms as
+        calculate_inventory_derivative.
+
+        Returns:
+            tuple: The bred (source), burned, decayed, lost and routed (inflow minus outflow) rates.
+        """
+        inflow = self.get_inflow()
+        outflow = self.get_outflow()
+        return (
+            self.tritium_source,
+            0.0,
+            self.tritium_inventory * LAMBDA,
+            outflow * self.non_radioactive_loss,
+            inflow - outflow,
+        )
 
     def calculate_inventory_derivative(self):
         """
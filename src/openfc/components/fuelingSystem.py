@@ -1,3 +1,4 @@
+import numpy as np
 from .component import Component
 
 class FuelingSystem(Component):
@@ -27,3 +28,16 @@ class FuelingSystem(Component):
             float: The outflow rate.
         """
         return self.N_burn/self.TBE 
+
+    def outflow_from_inventory(self, inventory):
+        """
+        Calculate the outflow rate of the fueling system for given inventory values.
+        The outflow does not depend on the inventory.
+
+        Args:
+            inventory (float or array): The tritium inventory of the fueling system.
+
+        Returns:
+            float or array: The outflow rate.
+        """
+        return np.full(np.shape(inventory), self.get_outflow())
@@ -1,3 +1,4 @@
+import numpy as np
 from .component import Component
 
 class Plasma(Component):
@@ -28,6 +29,40 @@ Z
         """
         return (1 - self.TBE - self.fp_div - self.fp_fw) / self.TBE * self.N_burn 
     
+    def outflow_from_inventory(self, inventory):
+        """
+        Calculate the outflow rate of the plasma for given inventory values.
+        The outflow does not depend on the inventory.
+
+        Args:
+            inventory (float or array): The tritium inventory of the plasma.
+
+        Returns:
+            float or array: The outflow rate.
+        """
+        return np.full(np.shape(inventory), self.get_outflow())
+
+    def loss_rates(self, inventory):
+        """
+        Calculate the rates at which tritium leaves the fuel cycle in the plasma. Only burn is modelled.
+
+        Args:
+            inventory (float or array): The tritium inventory of the plasma.
+
+        Returns:
+            dict: The non-radioactive loss, decay, source and burn rates.
+        """
+        return {'loss': 0.0, 'decay': 0.0, 'source': 0.0, 'burn': self.N_burn}
+
+    def ledger_rates(self):
+        """
+        Calculate the current rates of the conservation ledger channels. Only burn is modelled.
+
+        Returns:
+            tuple: The bred, burned, decayed, lost and routed (inflow minus outflow) rates.
+        """
+        return (0.0, self.N_burn, 0.0, 0.0, self.get_inflow() - self.get_outflow())
+
     def calculate_inventory_derivative(self):
         """
         Calculate the derivative of the plasma inventory.
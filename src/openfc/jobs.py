@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from openfc.tools.evaluation import evaluate_design
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def case_hash(params):
+    """
+    Returns the content hash of a case definition.
+
+    Args:
+        params (dict): Parameter values of the case. Must be JSON serializable.
+
+    Returns:
+        str: The SHA-256 hex digest of the canonical JSON representation.
+    """
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+class JobStore:
+    """
+    Persistent store of sweep cases and results in a SQLite file.
+
+    Cases are identified by the content hash of their parameters, so adding the same case twice
+    has no effect and completed cases are never simulated again. Workers claim batches of cases
+    with a lease: cases claimed by a worker that died are claimed again once the lease expires.
+    After an interruption, release() puts the cases claimed by workers that died back in the queue
+    without waiting for their lease. A store describes one sweep, i.e. one plant builder and one set of Simulate arguments.
+
+    Claims rely on SQLite file locking, which is unreliable on network filesystems such as NFS.
+    Keep the store on a local disk (e.g. one node running run_local), or make sure the shared
+    filesystem supports POSIX locks, otherwise two workers may claim the same case.
+    """
+
+    def __init__(self, path, timeout=60):
+        """
+        Opens (and creates if needed) a job store.
+
+        Args:
+            path (str): Path of the SQLite file, on a filesystem accessible to all workers.
+            timeout (float, optional): Time in seconds to wait for a lock held by another worker. Defaults to 60.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS cases (
+                hash TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                claimed_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS cases_status ON cases (status)")
+
+    def close(self):
+        """
+        Closes the connection to the store.
+        """
+        self.connection.close()
+
+    def add_cases(self, param_list):
+        """
+        Adds cases to the store. Cases already in the store are skipped.
+
+        Args:
+            param_list (list): List of parameter dictionaries.
+
+        Returns:
+            int: The number of new cases.
+        """
+        rows = [(case_hash(params), json.dumps(params, sort_keys=True)) for params in param_list]
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.connection.total_changes
+            self.connection.executemany("INSERT OR IGNORE INTO cases (hash, params) VALUES (?, ?)", rows)
+            added = self.connection.total_changes - before
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, n, worker, lease=3600):
+        """
+        Atomically claims up to n cases that are pending or whose lease has expired.
+
+        Args:
+            n (int): Maximum number of cases.
+            worker (str): Identifier of the worker.
+            lease (float, optional): Time in seconds after which a running case may be claimed again. Defaults to 3600.
+
+        Returns:
+            list: List of (hash, params) tuples.
+        """
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.connection.execute(
+                "SELECT hash, params FROM cases WHERE status = ? OR (status = ? AND claimed_at < ?) LIMIT ?",
+                (PENDING, RUNNING, now - lease, n)).fetchall()
+            self.connection.executemany(
+                "UPDATE cases SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE hash = ?",
+                [(RUNNING, worker, now, case) for case, _ in rows])
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return [(case, json.loads(params)) for case, params in rows]
+
+    def complete(self, case, result, worker):
+        """
+        Stores the result of a case and marks it as done.
+
+        Only the worker currently holding the lease can complete a case: a worker whose lease expired
+        and whose case was claimed again by another worker leaves it untouched.
+
+        Args:
+            case (str): The case hash.
+            result (dict): The outputs of the case.
+            worker (str): Identifier of the worker that claimed the case.
+
+        Returns:
+            bool: True if the case was updated.
+        """
+        return self.connection.execute(
+            "UPDATE cases SET status = ?, result = ?, error = NULL WHERE hash = ? AND status = ? AND worker = ?",
+            (DONE, json.dumps(result), case, RUNNING, worker)).rowcount == 1
+
+    def fail(self, case, error, worker):
+        """
+        Marks a case as failed. Like complete(), only the worker holding the lease can fail a case,
+        so a case that is already done is never downgraded.
+
+        Args:
+            case (str): The case hash.
+            error (str): Description of the error.
+            worker (str): Identifier of the worker that claimed the case.
+
+        Returns:
+            bool: True if the case was updated.
+        """
+        return self.connection.execute(
+            "UPDATE cases SET status = ?, error = ? WHERE hash = ? AND status = ? AND worker = ?",
+            (FAILED, error, case, RUNNING, worker)).rowcount == 1
+
+    def release(self, worker=None):
+        """
+        Marks running cases as pending again, e.g. to resume a sweep after its workers were killed.
+        Only call it when the workers holding the cases are no longer running.
+
+        Args:
+            worker (str, optional): Identifier of the worker whose cases are released. Defaults to all workers.
+
+        Returns:
+            int: The number of cases requeued.
+        """
+        if worker is None:
+            return self.connection.execute("UPDATE cases SET status = ?, worker = NULL WHERE status = ?",
+                                           (PENDING, RUNNING)).rowcount
+        return self.connection.execute("UPDATE cases SET status = ?, worker = NULL WHERE status = ? AND worker = ?",
+                                       (PENDING, RUNNING, worker)).rowcount
+
+    def retry_failed(self):
+        """
+        Marks failed cases as pending again.
+
+        Returns:
+            int: The number of cases requeued.
+        """
+        return self.connection.execute("UPDATE cases SET status = ? WHERE status = ?", (PENDING, FAILED)).rowcount
+
+    def counts(self):
+        """
+        Returns the number of cases per status.
+        """
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(self.connection.execute("SELECT status, COUNT(*) FROM cases GROUP BY status").fetchall())
+        return counts
+
+    def results(self):
+        """
+        Returns the completed cases.
+
+        Returns:
+            list: List of (params, result) tuples.
+        """
+        rows = self.connection.execute("SELECT params, result FROM cases WHERE status = ? ORDER BY hash", (DONE,))
+        return [(json.loads(params), json.loads(result)) for params, result in rows]
+
+
+def run_worker(path, build_plant, simulate_kwargs, outputs=None, batch_size=8, worker=None, lease=3600):
+    """
+    Runs a worker that claims batches of cases from a job store until none are left.
+
+    Args:
+        path (str): Path of the job store.
+        build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+        simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+        outputs (dict, optional): Mapping of output names to functions taking the Simulate object.
+        batch_size (int, optional): Number of cases claimed at once. Defaults to 8.
+        worker (str, optional): Identifier of the worker. Defaults to host name and process id.
+        lease (float, optional): Time in seconds after which unfinished cases of a dead worker are claimed again.
+            It must be longer than the time needed to run a batch. Defaults to 3600.
+
+    Returns:
+        int: The number of cases completed by this worker.
+    """
+    if worker is None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+    store = JobStore(path)
+    completed = 0
+    try:
+        while True:
+            batch = store.claim(batch_size, worker, lease)
+            if not batch:
+                return completed
+            for case, params in batch:
+                try:
+                    result = evaluate_design(build_plant, params, simulate_kwargs, outputs)
+                except Exception as error:
+                    store.fail(case, repr(error), worker)
+                    continue
+                if store.complete(case, result, worker):
+                    completed += 1
+    finally:
+        store.close()
+
+
+def run_local(path, build_plant, simulate_kwargs, outputs=None, n_workers=2, batch_size=8, lease=3600,
+              resume=False):
+    """
+    Runs several workers as processes on this machine.
+
+    Args:
+        path (str): Path of the job store.
+        build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap. Must be picklable.
+        simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+        outputs (dict, optional): Mapping of output names to functions taking the Simulate object.
+        n_workers (int, optional): Number of worker processes. Defaults to 2.
+        batch_size (int, optional): Number of cases claimed at once by a worker. Defaults to 8.
+        lease (float, optional): Lease of the claimed cases in seconds. Defaults to 3600.
+        resume (bool, optional): If True, first release the cases left running by previous workers,
+            e.g. after the sweep was interrupted. Do not use while other workers are running. Defaults to False.
+
+    Returns:
+        int: The number of cases completed.
+    """
+    if resume:
+        store = JobStore(path)
+        store.release()
+        store.close()
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(run_worker, path, build_plant, simulate_kwargs, outputs, batch_size, None, lease)
+                   for _ in range(n_workers)]
+        return sum(future.result() for future in futures)
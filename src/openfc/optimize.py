@@ -0,0 +1,177 @@
+import numpy as np
+from openfc.tools.evaluation import (doubling_margin, evaluate_designs, required_startup_inventory, required_TBR,
+                                     reserve_margin, startup_inventory)
+
+
+class DesignOptimizer:
+    """
+    Constrained optimization of plant parameters, e.g. residence times, f_dir and TBE.
+
+    The default problem minimizes the required startup inventory, i.e. the smallest startup inventory
+    that never lets the Fueling System dip below the reserve inventory, subject to doubling within the
+    target doubling time. Simulate.run only ever raises the startup inventory set by the builder, so its
+    final I_startup is flat over all designs that meet the reserve; the required inventory is not.
+    The doubling constraint is evaluated on the trajectory shifted to the required inventory, so the
+    objective, constraints and outputs all describe the plant with the simulated TBR started at I_required.
+    Evaluations are cached, so that objective and constraints at the same parameter point only run one simulation.
+
+    Attributes:
+        cache (dict): Mapping of rounded parameter tuples to output dictionaries.
+        n_simulations (int): Number of simulations run.
+    """
+
+    def __init__(self, build_plant, bounds, simulate_kwargs, objective='I_required', max_TBR=None,
+                 n_workers=None, decimals=12):
+        """
+        Args:
+            build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+            bounds (dict): Mapping of the optimized parameter names to (lower, upper) bounds.
+            simulate_kwargs (dict or callable): Keyword arguments passed to Simulate. The target
+                doubling time and reserve inventory are taken from the Simulate object.
+            objective (str, optional): Name of the output to minimize: 'I_required', 'I_startup' or 'TBR'.
+                Defaults to 'I_required'.
+            max_TBR (float, optional): If given, also constrain the required TBR below this value.
+            n_workers (int, optional): Number of worker processes used to evaluate populations.
+                Defaults to serial evaluation.
+            decimals (int, optional): Number of decimals used to round parameters in the cache key.
+        """
+        self.build_plant = build_plant
+        self.parameter_names = list(bounds.keys())
+        self.bounds = [tuple(bounds[name]) for name in self.parameter_names]
+        self.simulate_kwargs = simulate_kwargs
+        self.objective = objective
+        self.max_TBR = max_TBR
+        self.n_workers = n_workers
+        self.decimals = decimals
+        self.outputs = {
+            'I_startup': startup_inventory,
+            'I_required': required_startup_inventory,
+            'TBR': required_TBR,
+            'doubling_margin': doubling_margin,
+            'reserve_margin': reserve_margin,
+        }
+        self.cache = {}
+        self.n_simulations = 0
+
+    def _key(self, x):
+        # Some methods (e.g. COBYLA) may step slightly outside the bounds: evaluate at the nearest valid point
+        lower, upper = np.array(self.bounds, dtype=float).T
+        return tuple(np.round(np.clip(np.asarray(x, dtype=float), lower, upper), self.decimals))
+
+    def to_params(self, x):
+        """
+        Converts a parameter vector to a parameter dictionary.
+        """
+        return dict(zip(self.parameter_names, map(float, x)))
+
+    def evaluate_many(self, X):
+        """
+        Evaluates several parameter vectors, simulating in parallel only those not already cached.
+
+        Args:
+            X (list): List of parameter vectors.
+
+        Returns:
+            list: List of output dictionaries.
+        """
+        keys = [self._key(x) for x in X]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        if missing:
+            results = evaluate_designs(self.build_plant, [self.to_params(key) for key in missing],
+                                       self.simulate_kwargs, self.outputs, self.n_workers)
+            self.cache.update(zip(missing, results))
+            self.n_simulations += len(missing)
+        return [self.cache[key] for key in keys]
+
+    def evaluate(self, x):
+        """
+        Evaluates a single parameter vector.
+
+        Returns:
+            dict: Output dictionary.
+        """
+        return self.evaluate_many([x])[0]
+
+    def constraints(self, x):
+        """
+        Returns the constraint margins at x. All margins must be non-negative for a feasible design.
+        The reserve constraint is only used when the objective is not 'I_required', which meets it by construction.
+
+        Returns:
+            dict: Mapping of constraint names to margins.
+        """
+        result = self.evaluate(x)
+        margins = {'doubling_margin': result['doubling_margin']}
+        if self.objective != 'I_required':
+            margins['reserve_margin'] = result['reserve_margin']
+        if self.max_TBR is not None:
+            margins['TBR_margin'] = self.max_TBR - result['TBR']
+        return margins
+
+    def penalized_objective(self, x, penalty=1e3):
+        """
+        Returns the objective plus penalty times the sum of the constraint violations.
+        """
+        violation = sum(max(0.0, -margin) for margin in self.constraints(x).values())
+        return self.evaluate(x)[self.objective] + penalty * violation
+
+    def _map(self, func, iterable):
+        # Map-like callable for scipy: simulate the whole population at once, then read from the cache
+        X = list(iterable)
+        self.evaluate_many(X)
+        return [func(x) for x in X]
+
+    def _result(self, result):
+        result.x = np.array(self._key(result.x))
+        result.params = self.to_params(result.x)
+        result.outputs = self.evaluate(result.x)
+        result.n_simulations = self.n_simulations
+        result.feasible = all(margin >= 0 for margin in self.constraints(result.x).values())
+        return result
+
+    def minimize(self, x0=None, method='COBYLA', **options):
+        """
+        Runs a local constrained optimization with scipy.optimize.minimize.
+
+        Args:
+            x0 (dict or array, optional): Initial parameters. Defaults to the center of the bounds.
+            method (str, optional): A scipy method supporting constraints. Defaults to 'COBYLA', which
+                does not need gradients of the (piecewise constant in TBR) simulation outputs.
+            **options: Additional options passed to scipy.optimize.minimize.
+
+        Returns:
+            OptimizeResult: The scipy result, with additional params, outputs, feasible and n_simulations attributes.
+        """
+        from scipy.optimize import minimize
+        if x0 is None:
+            x0 = [(lower + upper) / 2 for lower, upper in self.bounds]
+        elif isinstance(x0, dict):
+            x0 = [x0[name] for name in self.parameter_names]
+        names = list(self.constraints(x0))
+        constraints = [{'type': 'ineq', 'fun': lambda x, name=name: self.constraints(x)[name]} for name in names]
+        result = minimize(lambda x: self.evaluate(x)[self.objective], x0, method=method,
+                          bounds=self.bounds, constraints=constraints, **options)
+        return self._result(result)
+
+    def differential_evolution(self, penalty=1e3, popsize=10, maxiter=50, seed=None, **options):
+        """
+        Runs a global, population-based optimization with scipy.optimize.differential_evolution.
+
+        Each generation is simulated in parallel on n_workers processes. Constraints are handled
+        with a penalty so that the objective and constraints of a candidate share one simulation.
+
+        Args:
+            penalty (float, optional): Weight of the constraint violations. Defaults to 1e3.
+            popsize (int, optional): Population size multiplier. Defaults to 10.
+            maxiter (int, optional): Maximum number of generations. Defaults to 50.
+            seed (int, optional): Seed of the optimizer.
+            **options: Additional options passed to scipy.optimize.differential_evolution.
+
+        Returns:
+            OptimizeResult: The scipy result, with additional params, outputs, feasible and n_simulations attributes.
+        """
+        from scipy.optimize import differential_evolution
+        options.setdefault('polish', False)
+        result = differential_evolution(self.penalized_objective, self.bounds, args=(penalty,), popsize=popsize,
+                                        maxiter=maxiter, seed=seed, workers=self._map, updating='deferred', **options)
+        return self._result(result)
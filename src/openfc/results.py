@@ -0,0 +1,209 @@
+import numpy as np
+
+
+class Results:
+    """
+    Post-processing of a simulation.
+
+    Inventories are stored once as a 2D array. Columns, per-port flows and reductions are computed
+    on demand from the inventories and the port fractions of the component map, and cached.
+
+    Attributes:
+        time (array): Time values in seconds.
+        component_names (list): Names of the components, in the column order of the inventories.
+        I_reserve (float): Reserve inventory of the Fueling System, if known.
+    """
+
+    def __init__(self, time, y, component_map, I_reserve=None):
+        """
+        Initializes a Results object.
+
+        Args:
+            time (array): Time values in seconds.
+            y (array or list): Component inventories of shape (len(time), n_components).
+            component_map (ComponentMap): The component map used in the simulation.
+            I_reserve (float, optional): Reserve inventory of the Fueling System.
+        """
+        self.time = np.asarray(time, dtype=float)
+        self._y = y
+        self.component_map = component_map
+        self.components = component_map.components
+        self.component_names = list(self.components.keys())
+        self._index = {name: i for i, name in enumerate(self.component_names)}
+        self.I_reserve = I_reserve
+        self._cache = {}
+        # Port names are only unique within a component: ports are keyed by (component name, port name)
+        self._ports = {}
+        self._port_owners = {}
+        for component_name, ports in component_map.connections.items():
+            component = self.components[component_name]
+            for port_name, (connected_component_name, connected_port_name) in ports.items():
+                kind = 'output' if port_name in component.output_ports else 'input'
+                self._ports[(component_name, port_name)] = (kind, connected_component_name, connected_port_name)
+                self._port_owners.setdefault(port_name, []).append(component_name)
+
+    @classmethod
+    def from_simulation(cls, simulation):
+        """
+        Creates a Results object from a Simulate object after run().
+        """
+        return cls(simulation.time, simulation.y[:len(simulation.time)], simulation.component_map, simulation.I_reserve)
+
+    @property
+    def y(self):
+        """
+        Returns the component inventories as an array of shape (len(time), n_components).
+        """
+        if 'y' not in self._cache:
+            self._cache['y'] = np.asarray(self._y, dtype=float).reshape(len(self.time), len(self.component_names))
+            self._y = None
+        return self._cache['y']
+
+    def __getitem__(self, name):
+        """
+        Returns the inventory of a component or the flow rate through a port.
+
+        Args:
+            name (str or tuple): A component name, a (component name, port name) tuple,
+                or a port name that belongs to a single component.
+        """
+        if isinstance(name, tuple):
+            return self.port_flow(*name)
+        if name in self._index:
+            return self.inventory(name)
+        owners = self._port_owners.get(name, [])
+        if len(owners) == 1:
+            return self.port_flow(owners[0], name)
+        elif len(owners) > 1:
+            raise KeyError(f"Port {name} belongs to several components ({', '.join(owners)}): use a (component, port) tuple")
+        raise KeyError(f"{name} is neither a component nor a connected port")
+
+    def __len__(self):
+        return len(self.time)
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def inventory(self, component_name):
+        """
+        Returns the tritium inventory of a component.
+        """
+        return self.y[:, self._index[component_name]]
+
+    def outflow(self, component_name):
+        """
+        Returns the outflow rate of a component, reconstructed from its inventory.
+        """
+        component = self.components[component_name]
+        return self._cached(('outflow', component_name), lambda: component.outflow_from_inventory(self.inventory(component_name)))
+
+    def port_flow(self, component_name, port_name):
+        """
+        Returns the flow rate through a connected port, reconstructed from the inventory of the upstream component.
+
+        Args:
+            component_name (str): The name of the component that owns the port.
+            port_name (str): The name of the port.
+        """
+        def compute():
+            kind, connected_component_name, connected_port_name = self._ports[(component_name, port_name)]
+            if kind == 'output':
+                port = self.components[component_name].output_ports[port_name]
+                return self.outflow(component_name) * port.outgoing_fraction
+            port = self.components[component_name].input_ports[port_name]
+            upstream_port = self.components[connected_component_name].output_ports[connected_port_name]
+            return self.outflow(connected_component_name) * upstream_port.outgoing_fraction * port.incoming_fraction
+        return self._cached(('port', component_name, port_name), compute)
+
+    def inflow(self, component_name):
+        """
+        Returns the total inflow rate of a component.
+        """
+        def compute():
+            inflow = np.zeros_like(self.time)
+            for port_name in self.components[component_name].input_ports:
+                if (component_name, port_name) in self._ports:
+                    inflow = inflow + self.port_flow(component_name, port_name)
+            return inflow
+        return self._cached(('inflow', component_name), compute)
+
+    def _subset(self, time, y):
+        return Results(time, y, self.component_map, self.I_reserve)
+
+    def slice(self, t_start=None, t_end=None):
+        """
+        Returns the results between t_start and t_end (in seconds, inclusive).
+        """
+        mask = np.ones(len(self.time), dtype=bool)
+        if t_start is not None:
+            mask &= self.time >= t_start
+        if t_end is not None:
+            mask &= self.time <= t_end
+        return self._subset(self.time[mask], self.y[mask])
+
+    def resample(self, time):
+        """
+        Returns the results linearly interpolated at new time values (in seconds).
+        """
+        time = np.asarray(time, dtype=float)
+        y = np.column_stack([np.interp(time, self.time, self.y[:, i]) for i in range(len(self.component_names))])
+        return self._subset(time, y)
+
+    def _integrate(self, rate):
+        # Left rectangle rule, consistent with the forward Euler integration
+        rate = np.broadcast_to(rate, self.time.shape)
+        return np.sum(rate[:-1] * np.diff(self.time))
+
+    def _rate_totals(self, channel):
+        return self._cached(('total', channel), lambda: {
+            name: float(self._integrate(component.loss_rates(self.inventory(name))[channel]))
+            for name, component in self.components.items()
+        })
+
+    def cumulative_losses(self):
+        """
+        Returns the non-radioactive tritium losses of every component, integrated over the results.
+
+        Returns:
+            dict: Mapping of component names to losses in kg.
+        """
+        return self._rate_totals('loss')
+
+    def decay_totals(self):
+        """
+        Returns the tritium decayed in every component, integrated over the results.
+
+        Returns:
+            dict: Mapping of component names to decayed tritium in kg.
+        """
+        return self._rate_totals('decay')
+
+    def burned_total(self):
+        """
+        Returns the tritium burned in the plasma, integrated over the results, in kg.
+        """
+        return sum(self._rate_totals('burn').values())
+
+    def bred_total(self):
+        """
+        Returns the tritium produced by component sources (e.g. the breeding blanket), integrated over the results, in kg.
+        """
+        return sum(self._rate_totals('source').values())
+
+    def time_above_reserve(self, I_reserve=None, component_name='Fueling System'):
+        """
+        Returns the time during which the inventory of a component is at or above the reserve inventory.
+
+        Args:
+            I_reserve (float, optional): Reserve inventory. Defaults to the reserve inventory of the simulation.
+            component_name (str, optional): Defaults to 'Fueling System'.
+
+        Returns:
+            float: Time in seconds.
+        """
+        if I_reserve is None:
+            I_reserve = self.I_reserve
+        above = (self.inventory(component_name) >= I_reserve).astype(float)
+        return float(self._integrate(above))
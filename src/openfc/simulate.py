@@ -1,8 +1,11 @@
 import numpy as np
+from openfc.ledger import Ledger
+from openfc.results import Results
+from openfc.streaming import Crossing, Minimum
 seconds_to_years = 1/(60*60*24*365)
 
 class Simulate:
-    def __init__(self, dt, final_time, I_reserve, component_map, dt_max=100, max_simulations = 100, TBRr_accuraty = 1e-3, target_doubling_time = 2):
+    def __init__(self, dt, final_time, I_reserve, component_map, dt_max=100, max_simulations = 100, TBRr_accuraty = 1e-3, target_doubling_time = 2, store_flows = False, ledger = False):
         """
         Initialize the Simulate class.
 
@@ -10,6 +13,10 @@ class Simulate:
         - dt: Time step size.
         - final_time: Final simulation time.
         - component_map: Mapping of component names to Component objects.
+        - store_flows: If True, append inflows and outflows to the component lists at every step, over every
+          pass of run(). Defaults to False: flows are reconstructed after the run with results() instead.
+        - ledger: If True, integrate the conservation ledger alongside the state and store the
+          mass balance of every run in self.mass_balance. Costs one extra pass over the components per step.
         """
         self.dt = dt
         self.initial_step_size = dt
@@ -28,6 +35,10 @@ class Simulate:
         self.I_reserve = I_reserve
         self.simulation_count = 0
         self.max_simulations = max_simulations
+        self.store_flows = store_flows
+        self.ledger = Ledger() if ledger else None
+        self.mass_balance = None
+        self.final_state = None
 
     def run(self, tolerance = 1e-3):
         """
@@ -41,6 +52,7 @@ class Simulate:
             self.simulation_count += 1
             self.y[0] = [component.tritium_inventory for component in self.components.values()] # self.initial_conditions, possibly updated by the restart method
             t,y = self.forward_euler()
+            self.print_mass_balance()
             self.doubling_time = self.compute_doubling_time(t,y)
             print(f"Doubling time: {self.doubling_time} \n")
             print('Startup inventory is: {} \n'.format(y[0][0]))
@@ -62,6 +74,15 @@ class Simulate:
                 self.y.pop() # remove the last element of y whose time is greater than the final time
                 return t,y
             
+    def results(self):
+        """
+        Return the post-processing object of the last run.
+
+        Returns:
+        - results: Results object with lazy access to inventories, port flows and reductions.
+        """
+        return Results.from_simulation(self)
+
     def compute_doubling_time(self, t, y):
         """
         Compute the doubling time of the tritium inventory in the Fueling System component.
@@ -139,23 +160,159 @@ class Simulate:
         """
         t = 0
         print(f'Initial inventories = {self.y[0]} kg')
+        if self.ledger is not None:
+            self.ledger.reset(np.sum(self.y[0]))
         while t < self.final_time:
-            # Store flows
-            for component in self.components.values():
-                component.store_flows()
-            if abs(t % self.interval) < 10:
-                print(f"Percentage completed = {abs(t - self.final_time)/self.final_time * 100:.1f}%", end='\r')
-            dydt = self.f(self.y[-1])
-            y_new = self.y[-1] + self.dt * dydt
+            y_new = self.step(self.y[-1], t, self.store_flows)
             self.time.append(t)
-            for i, component in enumerate(self.components.values()):
-                component.update_inventory(y_new[i])
-            self.component_map.update_flow_rates()
-            self.adaptive_timestep(y_new, self.y[-1], t)  # Update the timestep based on the new and old y values
             t += self.dt
             self.y.append(y_new) # append y_new after updating the time step        
+        self.close_ledger(self.y[-1])
         return [self.time, self.y]
 
+    def stream(self, chunk_size=1000, reducers=()):
+        """
+        Perform the forward Euler integration with constant memory.
+
+        States are not stored in self.time and self.y, and flows are not stored in the components.
+        Chunks are yielded as they are produced, after updating the reducers.
+
+        Args:
+        - chunk_size: Number of time steps per chunk.
+        - reducers: Reducers from openfc.streaming (e.g. Minimum, Maximum, Crossing, Downsample), reset at the start.
+
+        Yields:
+        - t: Array of time values of shape (n,), with n <= chunk_size.
+        - y: Array of component inventory values of shape (n, n_components).
+        """
+        component_names = list(self.components.keys())
+        for reducer in reducers:
+            reducer.bind(component_names)
+        t = 0
+        y = np.array([component.tritium_inventory for component in self.components.values()], dtype=float)
+        print(f'Initial inventories = {list(y)} kg')
+        if self.ledger is not None:
+            self.ledger.reset(np.sum(y))
+        t_chunk = np.empty(chunk_size)
+        y_chunk = np.empty((chunk_size, len(y)))
+        n = 0
+        while t < self.final_time:
+            t_chunk[n] = t
+            y_chunk[n] = y
+            n += 1
+            y = self.step(y, t)
+            t += self.dt
+            if n == chunk_size:
+                for reducer in reducers:
+                    reducer.update(t_chunk, y_chunk)
+                yield t_chunk, y_chunk
+                t_chunk = np.empty(chunk_size)
+                y_chunk = np.empty((chunk_size, len(y)))
+                n = 0
+        if n > 0:
+            for reducer in reducers:
+                reducer.update(t_chunk[:n], y_chunk[:n])
+            yield t_chunk[:n], y_chunk[:n]
+        self.final_state = y # state after the last step, past the final time
+        self.close_ledger(y)
+
+    def run_streaming(self, tolerance = 1e-3, chunk_size = 1000, reducers = ()):
+        """
+        Run the simulation like run(), but with constant memory.
+
+        The startup inventory and TBR are updated as in run(), using reducers for the minimum
+        Fueling System inventory and the doubling time instead of the stored inventories.
+
+        Args:
+        - tolerance: Tolerance on the reserve inventory.
+        - chunk_size: Number of time steps per chunk.
+        - reducers: Additional reducers, holding the results of the last run on return.
+
+        Returns:
+        - results: List of the results of the additional reducers.
+        """
+        while True:
+            self.simulation_count += 1
+            self.restart()
+            minimum = Minimum('Fueling System')
+            doubling = Crossing(2 * self.I_startup, 'Fueling System')
+            for _ in self.stream(chunk_size, [minimum, doubling, *reducers]):
+                pass
+            self.print_mass_balance()
+            self.doubling_time = np.nan if doubling.first is None else doubling.first * seconds_to_years
+            print(f"Doubling time: {self.doubling_time} \n")
+            print('Startup inventory is: {} \n'.format(self.I_startup))
+            # Like run(), include the state past the final time in the reserve check
+            difference = min(minimum.result, self.final_state[0]) - self.I_reserve
+            if difference < -tolerance and self.simulation_count < self.max_simulations:
+                print("Error: Tritium inventory in Fueling System is below zero. Difference is {} kg".format(difference))
+                self.update_I_startup(difference)
+                print(f"Updated I_startup to {self.I_startup}")
+            elif self.doubling_time >= self.target_doubling_time or np.isnan(self.doubling_time) and self.simulation_count < self.max_simulations:
+                self.components['BB'].TBR += self.TBRr_accuracy
+                print('Updated TBR at {}. Production is now {}'.format(self.components['BB'].TBR, self.components['BB'].tritium_source))
+            else:
+                return [reducer.result for reducer in reducers]
+
+    def close_ledger(self, y):
+        """
+        Compute the mass balance of the run from the final inventories.
+
+        Args:
+        - y: Array of component inventory values at the end of the run.
+        """
+        if self.ledger is None:
+            return
+        self.mass_balance = self.ledger.report(np.sum(y))
+        self.mass_balance['unmet_removal'] = sum(component.unmet_removal for component in self.components.values())
+
+    def print_mass_balance(self):
+        """
+        Print the closure error of the last run, if the ledger is enabled.
+        """
+        if self.mass_balance is not None:
+            print(f"\nMass balance closure error: {self.mass_balance['closure_error']:.3e} kg (relative {self.mass_balance['relative_closure_error']:.3e})")
+
+    def step(self, y, t, store_flows=False):
+        """
+        Perform one forward Euler step and update the time step size.
+
+        Args:
+        - y: Array of component inventory values at time t.
+        - t: Current time.
+        - store_flows: If True, append inflows and outflows to the component lists.
+
+        Returns:
+        - y_new: Array of component inventory values at the next time step.
+        """
+        # Store flows
+        if store_flows:
+            for component in self.components.values():
+                component.store_flows()
+        if abs(t % self.interval) < 10:
+            print(f"Percentage completed = {abs(t - self.final_time)/self.final_time * 100:.1f}%", end='\r')
+        dydt = self.f(y)
+        y_new = y + self.dt * dydt
+        if self.ledger is not None:
+            self.ledger.add(self.dt * self.ledger_rates())
+        for i, component in enumerate(self.components.values()):
+            component.update_inventory(y_new[i])
+        self.component_map.update_flow_rates()
+        self.adaptive_timestep(y_new, y, t)  # Update the timestep based on the new and old y values
+        return y_new
+
+    def ledger_rates(self):
+        """
+        Calculate the rates of the conservation ledger channels (bred, burned, decayed, lost, routing).
+
+        Returns:
+        - rates: Array of rates in kg/s, summed over all components.
+        """
+        rates = [0.0] * len(self.ledger.channels)
+        for component in self.components.values():
+            rates = [total + rate for total, rate in zip(rates, component.ledger_rates())]
+        return np.array(rates)
+
 
     def f(self, y):
         """
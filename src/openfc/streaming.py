@@ -0,0 +1,183 @@
+import numpy as np
+
+
+class Reducer:
+    """
+    Base class of the reducers attached to Simulate.stream.
+
+    A reducer is updated with every chunk of states and keeps a constant (or user-bounded) amount of memory.
+    """
+
+    def __init__(self, component=None):
+        """
+        Args:
+            component (str, optional): Name of the component to reduce. Defaults to all components.
+        """
+        self.component = component
+        self.column = slice(None)
+
+    def bind(self, component_names):
+        """
+        Resolves the component column and resets the reducer at the start of a stream.
+
+        Args:
+            component_names (list): Names of the components, in the column order of the states.
+        """
+        if self.component is not None:
+            self.column = component_names.index(self.component)
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the state of the reducer.
+        """
+
+    def update(self, t, y):
+        """
+        Updates the reducer with a chunk of states.
+
+        Args:
+            t (array): Time values of shape (n,).
+            y (array): Component inventories of shape (n, n_components).
+        """
+        raise NotImplementedError
+
+    @property
+    def result(self):
+        """
+        Returns the reduced value.
+        """
+        raise NotImplementedError
+
+
+class Minimum(Reducer):
+    """
+    Minimum inventory and the time at which it occurs.
+    """
+
+    _argbest = staticmethod(np.argmin)
+    _better = staticmethod(np.less)
+
+    def reset(self):
+        self.value = None
+        self.time = None
+
+    def update(self, t, y):
+        values = y[:, self.column]
+        index = self._argbest(values, axis=0)
+        best = values[index] if np.ndim(index) == 0 else values[index, np.arange(values.shape[1])]
+        if self.value is None:
+            self.value, self.time = best, t[index]
+        else:
+            better = self._better(best, self.value)
+            self.value = np.where(better, best, self.value)
+            self.time = np.where(better, t[index], self.time)
+
+    @property
+    def result(self):
+        return self.value
+
+
+class Maximum(Minimum):
+    """
+    Maximum inventory and the time at which it occurs.
+    """
+
+    _argbest = staticmethod(np.argmax)
+    _better = staticmethod(np.greater)
+
+
+class Crossing(Reducer):
+    """
+    Times at which the inventory of a component crosses a threshold.
+
+    An upward crossing is the first sample at or above the threshold after a sample below it,
+    or the first sample of the stream if it starts at or above the threshold. Downward crossings are defined symmetrically.
+
+    Attributes:
+        first (float): Time of the first crossing, or None.
+        count (int): Number of crossings.
+        times (list): Times of the first max_crossings crossings.
+    """
+
+    def __init__(self, threshold, component, direction='up', max_crossings=100):
+        """
+        Args:
+            threshold (float): Inventory threshold in kg.
+            component (str): Name of the component.
+            direction (str, optional): 'up' or 'down'. Defaults to 'up'.
+            max_crossings (int, optional): Maximum number of crossing times kept. Defaults to 100.
+        """
+        super().__init__(component)
+        if direction not in ('up', 'down'):
+            raise ValueError("Direction must be 'up' or 'down'")
+        self.threshold = threshold
+        self.direction = direction
+        self.max_crossings = max_crossings
+
+    def reset(self):
+        self.first = None
+        self.count = 0
+        self.times = []
+        self._previous = None
+
+    def update(self, t, y):
+        values = y[:, self.column]
+        if self.direction == 'up':
+            state = values >= self.threshold
+        else:
+            state = values <= self.threshold
+        previous = np.concatenate(([False if self._previous is None else self._previous], state[:-1]))
+        crossings = t[state & ~previous]
+        self._previous = state[-1]
+        if len(crossings) == 0:
+            return
+        if self.first is None:
+            self.first = crossings[0]
+        self.count += len(crossings)
+        self.times.extend(crossings[:max(0, self.max_crossings - len(self.times))])
+
+    @property
+    def result(self):
+        return self.first
+
+
+class Downsample(Reducer):
+    """
+    Keeps one state every interval seconds, e.g. for plotting plant-lifetime simulations.
+    Memory grows with the simulated duration divided by the interval.
+    """
+
+    def __init__(self, interval, component=None):
+        """
+        Args:
+            interval (float): Time between kept samples, in seconds.
+            component (str, optional): Name of the component to keep. Defaults to all components.
+        """
+        super().__init__(component)
+        self.interval = interval
+
+    def reset(self):
+        self._time = []
+        self._y = []
+        self._next = 0.0
+
+    def update(self, t, y):
+        # Index of the first sample at or after each multiple of the interval within the chunk
+        targets = np.arange(self._next, t[-1] + self.interval, self.interval)
+        targets = targets[targets <= t[-1]]
+        if len(targets) == 0:
+            return
+        indices = np.unique(np.searchsorted(t, targets))
+        self._time.append(t[indices])
+        self._y.append(y[indices][:, self.column])
+        self._next = targets[-1] + self.interval
+
+    @property
+    def result(self):
+        """
+        Returns the kept time values and states.
+        """
+        if not self._time:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self._time), np.concatenate(self._y)
@@ -0,0 +1,267 @@
+import numpy as np
+from openfc.tools.evaluation import DEFAULT_OUTPUTS, evaluate_designs
+
+
+class GaussianProcess:
+    """
+    Gaussian process regression of a scalar output with an anisotropic squared exponential kernel.
+
+    Inputs are expected in the unit hypercube. Outputs are standardized internally,
+    and the kernel length scales and noise are fitted by maximizing the log marginal likelihood.
+    """
+
+    def __init__(self, length_scale=0.3, noise=1e-6, n_restarts=3, seed=None):
+        """
+        Args:
+            length_scale (float, optional): Initial length scale of every input. Defaults to 0.3.
+            noise (float, optional): Initial noise variance (relative to the output variance). Defaults to 1e-6.
+            n_restarts (int, optional): Number of random restarts of the hyperparameter optimization.
+            seed (int, optional): Seed of the restarts.
+        """
+        self.length_scale = length_scale
+        self.noise = noise
+        self.n_restarts = n_restarts
+        self.rng = np.random.default_rng(seed)
+        self.X = None
+
+    @staticmethod
+    def _kernel(X1, X2, length_scale):
+        d = (X1[:, None, :] - X2[None, :, :]) / length_scale
+        return np.exp(-0.5 * np.sum(d**2, axis=-1))
+
+    def _negative_log_likelihood(self, theta, X, y):
+        length_scale, noise = np.exp(theta[:-1]), np.exp(theta[-1])
+        K = self._kernel(X, X, length_scale) + (noise + 1e-10) * np.eye(len(X))
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            return 1e25
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+        return 0.5 * y @ alpha + np.sum(np.log(np.diag(L))) + 0.5 * len(X) * np.log(2 * np.pi)
+
+    def fit(self, X, y, optimize=True):
+        """
+        Fits the Gaussian process.
+
+        Args:
+            X (array): Training inputs of shape (n, d), in the unit hypercube.
+            y (array): Training outputs of shape (n,).
+            optimize (bool, optional): If True, fit the hyperparameters. Defaults to True.
+        """
+        from scipy.optimize import minimize
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = np.mean(y)
+        self.y_std = np.std(y) if np.std(y) > 0 else 1.0
+        y_scaled = (y - self.y_mean) / self.y_std
+        n_dim = X.shape[1]
+        theta0 = np.append(np.log(np.broadcast_to(self.length_scale, n_dim)), np.log(self.noise))
+        if optimize and len(X) > 2:
+            bounds = [(np.log(1e-2), np.log(1e2))] * n_dim + [(np.log(1e-10), np.log(1e-1))]
+            starts = [theta0] + [np.array([self.rng.uniform(*b) for b in bounds]) for _ in range(self.n_restarts)]
+            best = None
+            for start in starts:
+                result = minimize(self._negative_log_likelihood, start, args=(X, y_scaled), method='L-BFGS-B', bounds=bounds)
+                if best is None or result.fun < best.fun:
+                    best = result
+            theta0 = best.x
+        self.length_scale = np.exp(theta0[:-1])
+        self.noise = np.exp(theta0[-1])
+        K = self._kernel(X, X, self.length_scale) + (self.noise + 1e-10) * np.eye(len(X))
+        self.X = X
+        self._L = np.linalg.cholesky(K)
+        self._alpha = np.linalg.solve(self._L.T, np.linalg.solve(self._L, y_scaled))
+        return self
+
+    def predict(self, X, return_std=False):
+        """
+        Predicts the output at new inputs.
+
+        Args:
+            X (array): Inputs of shape (m, d), in the unit hypercube.
+            return_std (bool, optional): If True, also return the predictive standard deviation.
+
+        Returns:
+            array or tuple: Predicted mean of shape (m,), and standard deviation if return_std is True.
+        """
+        X = np.atleast_2d(X)
+        k = self._kernel(X, self.X, self.length_scale)
+        mean = self.y_mean + self.y_std * (k @ self._alpha)
+        if not return_std:
+            return mean
+        v = np.linalg.solve(self._L, k.T)
+        variance = np.clip(1.0 - np.sum(v**2, axis=0), 0, None)
+        return mean, self.y_std * np.sqrt(variance)
+
+    def loo_error(self):
+        """
+        Returns the root mean square leave-one-out cross-validation error, computed in closed form.
+        """
+        L_inv = np.linalg.solve(self._L, np.eye(len(self.X)))
+        K_inv_diag = np.sum(L_inv**2, axis=0)
+        residuals = self._alpha / K_inv_diag
+        return self.y_std * np.sqrt(np.mean(residuals**2))
+
+
+class Surrogate:
+    """
+    Emulator of fuel cycle outputs (e.g. required TBR and startup inventory) over plant parameters.
+
+    One Gaussian process is trained per output on sweep results. Predictions come with a standard
+    deviation, and refine() adds real simulations where the emulator is most uncertain.
+
+    Attributes:
+        X (array): Training parameters of shape (n, d), in physical units.
+        Y (dict): Mapping of output names to training outputs of shape (n,).
+        models (dict): Mapping of output names to fitted GaussianProcess.
+    """
+
+    def __init__(self, bounds, outputs=None, seed=None):
+        """
+        Args:
+            bounds (dict): Mapping of parameter names to (lower, upper) bounds.
+            outputs (dict, optional): Mapping of output names to functions taking the Simulate object,
+                used when the surrogate runs simulations. Defaults to required TBR and startup inventory.
+            seed (int, optional): Seed of the samplers and hyperparameter restarts.
+        """
+        self.parameter_names = list(bounds.keys())
+        self.lower = np.array([bounds[name][0] for name in self.parameter_names], dtype=float)
+        self.upper = np.array([bounds[name][1] for name in self.parameter_names], dtype=float)
+        if outputs is None:
+            outputs = {name: DEFAULT_OUTPUTS[name] for name in ('TBR', 'I_startup')}
+        self.outputs = outputs
+        self.seed = seed
+        self._sampler = None
+        self.X = np.empty((0, len(self.parameter_names)))
+        self.Y = {name: np.empty(0) for name in self.outputs}
+        self.models = {}
+
+    def _to_unit(self, X):
+        return (np.asarray(X, dtype=float) - self.lower) / (self.upper - self.lower)
+
+    def _from_unit(self, U):
+        return self.lower + np.asarray(U) * (self.upper - self.lower)
+
+    def _sample(self, n):
+        # One sampler per surrogate, so that refinement candidates continue the sequence used for training
+        if self._sampler is None:
+            from scipy.stats import qmc
+            self._sampler = qmc.Sobol(len(self.parameter_names), scramble=True, seed=self.seed)
+        return self._sampler.random(n)
+
+    def add_samples(self, X, Y):
+        """
+        Adds training data, e.g. from an existing sweep.
+
+        Args:
+            X (array or list): Parameter values of shape (n, d), or a list of parameter dictionaries.
+            Y (dict or list): Mapping of output names to arrays of shape (n,), or a list of output dictionaries.
+        """
+        if len(X) and isinstance(X[0], dict):
+            X = [[params[name] for name in self.parameter_names] for params in X]
+        if isinstance(Y, (list, tuple)):
+            Y = {name: [result[name] for result in Y] for name in self.outputs}
+        self.X = np.vstack([self.X, np.asarray(X, dtype=float)])
+        for name in self.outputs:
+            self.Y[name] = np.append(self.Y[name], np.asarray(Y[name], dtype=float))
+
+    def fit(self, optimize=True):
+        """
+        Fits one Gaussian process per output. Samples where an output is not finite are skipped.
+        """
+        U = self._to_unit(self.X)
+        for name, y in self.Y.items():
+            mask = np.isfinite(y)
+            model = self.models.get(name) or GaussianProcess(seed=self.seed)
+            self.models[name] = model.fit(U[mask], y[mask], optimize=optimize)
+        return self
+
+    def predict(self, params, return_std=False):
+        """
+        Predicts the outputs.
+
+        Args:
+            params (dict or array): A parameter dictionary, or an array of shape (m, d) in physical units.
+            return_std (bool, optional): If True, also return the predictive standard deviations.
+
+        Returns:
+            dict: Mapping of output names to predictions (and standard deviations if return_std is True).
+            A dictionary input returns scalars.
+        """
+        scalar = isinstance(params, dict)
+        if scalar:
+            params = [[params[name] for name in self.parameter_names]]
+        U = self._to_unit(np.atleast_2d(params))
+        predictions = {}
+        for name, model in self.models.items():
+            prediction = model.predict(U, return_std=return_std)
+            if scalar:
+                prediction = tuple(float(p[0]) for p in prediction) if return_std else float(prediction[0])
+            predictions[name] = prediction
+        return predictions
+
+    def error_estimate(self):
+        """
+        Returns the leave-one-out cross-validation error of every output.
+
+        Returns:
+            dict: Mapping of output names to the root mean square leave-one-out error.
+        """
+        return {name: model.loo_error() for name, model in self.models.items()}
+
+    def _simulate(self, U, build_plant, simulate_kwargs, n_workers):
+        X = self._from_unit(U)
+        param_list = [dict(zip(self.parameter_names, map(float, x))) for x in X]
+        results = evaluate_designs(build_plant, param_list, simulate_kwargs, self.outputs, n_workers)
+        self.add_samples(X, results)
+
+    def train(self, build_plant, simulate_kwargs, n_samples=32, n_workers=None):
+        """
+        Runs an initial Sobol sweep over the parameter bounds and fits the surrogate.
+
+        Args:
+            build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+            simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+            n_samples (int, optional): Number of simulations. Defaults to 32.
+            n_workers (int, optional): Number of worker processes. Defaults to serial evaluation.
+        """
+        self._simulate(self._sample(n_samples), build_plant, simulate_kwargs, n_workers)
+        return self.fit()
+
+    def refine(self, build_plant, simulate_kwargs, tol=0.01, max_simulations=64, batch_size=4,
+               n_candidates=1024, n_workers=None):
+        """
+        Adaptively refines the surrogate by simulating the candidates where it is most uncertain.
+
+        Args:
+            build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+            simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+            tol (float, optional): Stop when the largest predictive standard deviation over the candidates,
+                relative to the spread of the training outputs, is below tol for every output. Defaults to 0.01.
+            max_simulations (int, optional): Maximum number of new simulations. Defaults to 64.
+            batch_size (int, optional): Number of simulations added per iteration. Defaults to 4.
+            n_candidates (int, optional): Number of Sobol candidate points. Defaults to 1024.
+            n_workers (int, optional): Number of worker processes. Defaults to serial evaluation.
+
+        Returns:
+            float: The final largest relative predictive standard deviation.
+        """
+        if not self.models:
+            self.fit()
+        candidates = self._sample(n_candidates)
+        n_simulations = 0
+        while True:
+            score = np.zeros(len(candidates))
+            for model in self.models.values():
+                _, std = model.predict(candidates, return_std=True)
+                score = np.maximum(score, std / model.y_std)
+            max_score = np.max(score)
+            print(f"Surrogate: {len(self.X)} samples, max relative std = {max_score:.3e}")
+            if max_score < tol or n_simulations >= max_simulations:
+                return max_score
+            n = min(batch_size, max_simulations - n_simulations)
+            selected = np.argsort(score)[-n:]
+            self._simulate(candidates[selected], build_plant, simulate_kwargs, n_workers)
+            candidates = np.delete(candidates, selected, axis=0)
+            n_simulations += n
+            self.fit()
@@ -0,0 +1,126 @@
+import numpy as np
+from openfc.simulate import Simulate, seconds_to_years
+
+
+def startup_inventory(simulation):
+    """
+    Returns the startup inventory of the Fueling System found by the simulation.
+    """
+    return simulation.I_startup
+
+
+def doubling_time(simulation):
+    """
+    Returns the doubling time (in years) found by the simulation.
+    """
+    return simulation.doubling_time
+
+
+def required_TBR(simulation):
+    """
+    Returns the TBR of the breeding blanket required to meet the target doubling time.
+    """
+    return simulation.components['BB'].TBR
+
+
+def reserve_margin(simulation):
+    """
+    Returns the minimum margin between the Fueling System inventory and the reserve inventory.
+    A negative value means that the inventory dipped below I_reserve.
+    """
+    return np.min(np.array(simulation.y)[:, 0]) - simulation.I_reserve
+
+
+def required_startup_inventory(simulation):
+    """
+    Returns the smallest startup inventory that keeps the Fueling System at or above I_reserve.
+    Since the Fueling System outflow does not depend on its inventory, changing the startup inventory
+    shifts its whole trajectory, so this is the startup inventory minus the reserve margin.
+    """
+    return simulation.I_startup - reserve_margin(simulation)
+
+
+def required_doubling_time(simulation):
+    """
+    Returns the doubling time (in years) of the plant started at the required startup inventory.
+    Like required_startup_inventory, it uses the shifted Fueling System trajectory, which doubles the
+    required inventory at the first time the simulated inventory reaches 2 * I_startup - reserve_margin.
+    """
+    margin = reserve_margin(simulation)
+    index = np.flatnonzero(np.array(simulation.y)[:, 0] >= 2 * simulation.I_startup - margin)
+    if len(index) == 0:
+        return np.nan
+    return simulation.time[index[0]] * seconds_to_years
+
+
+def doubling_margin(simulation):
+    """
+    Returns the margin (in years) between the target doubling time and the doubling time of the plant
+    started at the required startup inventory, so that it describes the same design as required_startup_inventory.
+    If the inventory never doubles, the final time is used as a lower bound of the doubling time.
+    """
+    doubling_time = required_doubling_time(simulation)
+    if np.isnan(doubling_time):
+        return simulation.target_doubling_time - simulation.final_time * seconds_to_years
+    return simulation.target_doubling_time - doubling_time
+
+
+DEFAULT_OUTPUTS = {
+    'I_startup': startup_inventory,
+    'doubling_time': doubling_time,
+    'TBR': required_TBR,
+    'reserve_margin': reserve_margin,
+}
+
+
+def evaluate_design(build_plant, params, simulate_kwargs, outputs=None):
+    """
+    Builds a plant for a set of parameters, runs the simulation and extracts the requested outputs.
+
+    Args:
+        build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+        params (dict): Parameter values passed to build_plant.
+        simulate_kwargs (dict or callable): Keyword arguments passed to Simulate (except component_map).
+            If callable, it is called as simulate_kwargs(**params), e.g. when I_reserve depends on TBE.
+        outputs (dict, optional): Mapping of output names to functions taking the Simulate object.
+            Defaults to DEFAULT_OUTPUTS. Functions must be picklable to be used with worker processes.
+
+    Returns:
+        dict: Mapping of output names to float values.
+    """
+    if outputs is None:
+        outputs = DEFAULT_OUTPUTS
+    component_map = build_plant(**params)
+    kwargs = simulate_kwargs(**params) if callable(simulate_kwargs) else simulate_kwargs
+    simulation = Simulate(component_map=component_map, **kwargs)
+    simulation.run()
+    return {name: float(output(simulation)) for name, output in outputs.items()}
+
+
+def _evaluate_case(case):
+    """
+    Unpacks a (build_plant, params, simulate_kwargs, outputs) tuple. Used to map evaluate_design over worker processes.
+    """
+    return evaluate_design(*case)
+
+
+def evaluate_designs(build_plant, param_list, simulate_kwargs, outputs=None, n_workers=None):
+    """
+    Evaluates several parameter sets, optionally in parallel.
+
+    Args:
+        build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+        param_list (list): List of parameter dictionaries.
+        simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+        outputs (dict, optional): Mapping of output names to functions taking the Simulate object.
+        n_workers (int, optional): Number of worker processes. If None or 1, cases are evaluated serially.
+
+    Returns:
+        list: List of output dictionaries, in the same order as param_list.
+    """
+    cases = [(build_plant, params, simulate_kwargs, outputs) for params in param_list]
+    if n_workers is None or n_workers <= 1:
+        return [_evaluate_case(case) for case in cases]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_evaluate_case, cases))
@@ -1,6 +1,3 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-
 def visualize_connections(component_map):
     """
     Visualizes the connections between components in a component map.
@@ -11,6 +8,10 @@ def visualize_connections(component_map):
     Returns:
     - None
     """
+    # Imported here so that the package does not load networkx and matplotlib at import time
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
     # Create a directed graph
     G = nx.DiGraph()
 
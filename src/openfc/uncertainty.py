@@ -0,0 +1,384 @@
+import numpy as np
+from openfc.tools.evaluation import DEFAULT_OUTPUTS, evaluate_designs
+
+# Outputs checked for convergence by default. The reserve margin is excluded: once Simulate has raised
+# the startup inventory, it is the residual of the iteration, close to zero.
+CONVERGE_ON = ('I_startup', 'doubling_time')
+
+
+class RunningStats:
+    """
+    Streaming mean and variance of a scalar quantity (Welford's algorithm).
+
+    Attributes:
+        count (int): Number of finite values accumulated.
+        n_nan (int): Number of non-finite values skipped (e.g. doubling time never reached).
+        mean (float): Running mean.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.n_nan = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value):
+        """
+        Adds a value to the statistics.
+
+        Args:
+            value (float): The value to add. Non-finite values are counted but not accumulated.
+        """
+        if not np.isfinite(value):
+            self.n_nan += 1
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """
+        Returns the unbiased sample variance.
+        """
+        if self.count < 2:
+            return np.nan
+        return self._m2 / (self.count - 1)
+
+    @property
+    def standard_error(self):
+        """
+        Returns the standard error of the mean.
+        """
+        if self.count < 2:
+            return np.inf
+        return np.sqrt(self.variance / self.count)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of a single quantile with constant memory (P-square algorithm, Jain & Chlamtac 1985).
+    """
+
+    def __init__(self, p):
+        """
+        Args:
+            p (float): The quantile to estimate, between 0 and 1.
+        """
+        if not (0 < p < 1):
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self._heights = []
+        self._positions = np.arange(1, 6, dtype=float)
+        self._desired = np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5])
+        self._increments = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def update(self, value):
+        """
+        Adds a value to the estimator. Non-finite values are ignored.
+        """
+        if not np.isfinite(value):
+            return
+        if len(self._heights) < 5:
+            self._heights.append(value)
+            if len(self._heights) == 5:
+                self._heights = np.sort(np.asarray(self._heights, dtype=float))
+            return
+        q = self._heights
+        n = self._positions
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = np.searchsorted(q, value, side='right') - 1
+        n[k + 1:] += 1
+        self._desired += self._increments
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = np.sign(d)
+                q_new = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not (q[i - 1] < q_new < q[i + 1]):
+                    # Fall back to linear interpolation
+                    j = i + int(d)
+                    q_new = q[i] + d * (q[j] - q[i]) / (n[j] - n[i])
+                q[i] = q_new
+                n[i] += d
+
+    @property
+    def value(self):
+        """
+        Returns the current quantile estimate.
+        """
+        if len(self._heights) == 0:
+            return np.nan
+        if len(self._heights) < 5:
+            return float(np.quantile(self._heights, self.p))
+        return float(self._heights[2])
+
+
+class SobolAccumulator:
+    """
+    Streaming first-order and total Sobol indices of a scalar output.
+
+    Uses the Saltelli (2010) estimator for first-order indices and the Jansen estimator for total indices,
+    which only need running sums over the A, B and AB_i sample matrices. Outputs are centered on the
+    first f_A accumulated, so that the estimates do not depend on the mean of the output.
+    """
+
+    def __init__(self, n_params):
+        self.n_params = n_params
+        self.count = 0
+        self._reference = None
+        self._stats = RunningStats()
+        self._first = np.zeros(n_params)
+        self._total = np.zeros(n_params)
+
+    def update(self, f_A, f_B, f_AB):
+        """
+        Adds one row of the Saltelli design.
+
+        Args:
+            f_A (float): Output at sample A.
+            f_B (float): Output at sample B.
+            f_AB (array): Outputs at samples AB_i, where column i of A is taken from B.
+        """
+        f_AB = np.asarray(f_AB)
+        if not (np.isfinite(f_A) and np.isfinite(f_B) and np.all(np.isfinite(f_AB))):
+            return
+        if self._reference is None:
+            self._reference = f_A
+        self.count += 1
+        self._stats.update(f_A)
+        self._stats.update(f_B)
+        self._first += (f_B - self._reference) * (f_AB - f_A)
+        self._total += 0.5 * (f_A - f_AB)**2
+
+    @property
+    def first_order(self):
+        """
+        Returns the first-order Sobol indices.
+        """
+        if self.count < 2 or not self._stats.variance > 0:
+            return np.full(self.n_params, np.nan)
+        return self._first / self.count / self._stats.variance
+
+    @property
+    def total(self):
+        """
+        Returns the total Sobol indices.
+        """
+        if self.count < 2 or not self._stats.variance > 0:
+            return np.full(self.n_params, np.nan)
+        return self._total / self.count / self._stats.variance
+
+
+class UncertaintyQuantification:
+    """
+    Monte Carlo uncertainty quantification of fuel cycle outputs (startup inventory, doubling time, ...).
+
+    Samples are drawn with a low-discrepancy sequence over user-declared parameter distributions,
+    simulated in batches (optionally in parallel) and reduced into streaming statistics,
+    so that no trajectory is kept in memory.
+
+    Attributes:
+        stats (dict): Mapping of output names to RunningStats.
+        quantiles (dict): Mapping of output names to a dictionary of P2Quantile estimators.
+        sobol (dict): Mapping of output names to SobolAccumulator, if sensitivity is enabled.
+        n_samples (int): Number of parameter samples evaluated.
+        n_simulations (int): Number of calls to Simulate.run.
+    """
+
+    def __init__(self, build_plant, distributions, simulate_kwargs, outputs=None, sampling='sobol',
+                 quantiles=(0.05, 0.5, 0.95), sensitivity=False, n_workers=None, seed=None):
+        """
+        Initializes the uncertainty quantification.
+
+        Args:
+            build_plant (callable): Function called as build_plant(**params) that returns a ComponentMap.
+            distributions (dict): Mapping of parameter names to frozen scipy.stats distributions,
+                e.g. {'TBE': stats.uniform(0.01, 0.02)}. Samples are mapped through the inverse CDF (ppf).
+            simulate_kwargs (dict or callable): Keyword arguments passed to Simulate.
+            outputs (dict, optional): Mapping of output names to functions taking the Simulate object.
+                Defaults to startup inventory, doubling time, required TBR and reserve margin.
+            sampling (str, optional): 'sobol', 'lhs' or 'random'. Defaults to 'sobol'.
+            quantiles (tuple, optional): Quantiles to estimate for every output.
+            sensitivity (bool, optional): If True, estimate Sobol indices with the Saltelli design.
+                Each sample then costs n_params + 2 simulations. Defaults to False.
+            n_workers (int, optional): Number of worker processes. Defaults to serial evaluation.
+            seed (int, optional): Seed of the sampler.
+        """
+        self.build_plant = build_plant
+        self.distributions = dict(distributions)
+        self.parameter_names = list(self.distributions.keys())
+        self.simulate_kwargs = simulate_kwargs
+        self.outputs = DEFAULT_OUTPUTS if outputs is None else outputs
+        self.sensitivity = sensitivity
+        self.n_workers = n_workers
+        self.sampler = self._make_sampler(sampling, seed)
+        self.stats = {name: RunningStats() for name in self.outputs}
+        self.quantiles = {name: {p: P2Quantile(p) for p in quantiles} for name in self.outputs}
+        self.sobol = {name: SobolAccumulator(len(self.parameter_names)) for name in self.outputs} if sensitivity else {}
+        self.n_samples = 0
+        self.n_simulations = 0
+
+    def _make_sampler(self, sampling, seed):
+        from scipy.stats import qmc
+        d = len(self.parameter_names) * (2 if self.sensitivity else 1)
+        if sampling == 'sobol':
+            return qmc.Sobol(d, scramble=True, seed=seed)
+        elif sampling == 'lhs':
+            return qmc.LatinHypercube(d, seed=seed)
+        elif sampling == 'random':
+            rng = np.random.default_rng(seed)
+            return _RandomSampler(d, rng)
+        else:
+            raise ValueError(f"Unknown sampling method {sampling}")
+
+    def _to_params(self, u):
+        """
+        Maps a point of the unit hypercube to a parameter dictionary.
+        """
+        return {name: float(self.distributions[name].ppf(u_i)) for name, u_i in zip(self.parameter_names, u)}
+
+    def _run_batch(self, n):
+        """
+        Draws n samples, simulates them and updates the statistics.
+        """
+        n_params = len(self.parameter_names)
+        u = self.sampler.random(n)
+        # Keep away from the bounds where unbounded distributions have infinite ppf
+        u = np.clip(u, 1e-12, 1 - 1e-12)
+        if not self.sensitivity:
+            param_list = [self._to_params(row) for row in u]
+            results = evaluate_designs(self.build_plant, param_list, self.simulate_kwargs, self.outputs, self.n_workers)
+            for result in results:
+                self._update(result)
+        else:
+            A, B = u[:, :n_params], u[:, n_params:]
+            param_list = []
+            for a, b in zip(A, B):
+                param_list.append(self._to_params(a))
+                param_list.append(self._to_params(b))
+                for i in range(n_params):
+                    ab = a.copy()
+                    ab[i] = b[i]
+                    param_list.append(self._to_params(ab))
+            results = evaluate_designs(self.build_plant, param_list, self.simulate_kwargs, self.outputs, self.n_workers)
+            stride = n_params + 2
+            for k in range(n):
+                r_A, r_B, r_AB = results[k * stride], results[k * stride + 1], results[k * stride + 2:(k + 1) * stride]
+                self._update(r_A)
+                self._update(r_B)
+                for name in self.outputs:
+                    self.sobol[name].update(r_A[name], r_B[name], [r[name] for r in r_AB])
+        self.n_samples += n
+        self.n_simulations += len(param_list)
+
+    def _update(self, result):
+        for name, value in result.items():
+            self.stats[name].update(value)
+            for estimator in self.quantiles[name].values():
+                estimator.update(value)
+
+    def converged(self, rtol, atol=0.0, converge_on=None):
+        """
+        Checks whether the standard error of the mean of the selected outputs is below max(rtol * |mean|, atol).
+        Outputs without any finite sample yet (e.g. a doubling time that is never reached) are skipped.
+
+        Args:
+            rtol (float): Relative tolerance on the standard error of the mean.
+            atol (float, optional): Absolute tolerance on the standard error of the mean. Defaults to 0.
+            converge_on (tuple, optional): Names of the outputs to check. Defaults to the startup inventory
+                and doubling time when they are outputs, and to all outputs otherwise.
+        """
+        names = self._converge_on(converge_on)
+        checked = [self.stats[name] for name in names if self.stats[name].count > 0]
+        if not checked:
+            return False
+        for s in checked:
+            if s.count < 2 or s.standard_error > max(rtol * abs(s.mean), atol):
+                return False
+        return True
+
+    def _converge_on(self, converge_on):
+        if converge_on is None:
+            return [name for name in CONVERGE_ON if name in self.outputs] or list(self.outputs)
+        unknown = [name for name in converge_on if name not in self.outputs]
+        if unknown:
+            raise ValueError(f"Unknown outputs {unknown}")
+        return list(converge_on)
+
+    def run(self, max_samples=1024, batch_size=64, rtol=None, min_samples=None, atol=0.0, converge_on=None):
+        """
+        Runs the Monte Carlo loop.
+
+        Args:
+            max_samples (int, optional): Maximum number of samples. Defaults to 1024.
+            batch_size (int, optional): Number of samples per batch. Powers of 2 preserve the
+                balance properties of the Sobol sequence. Defaults to 64.
+            rtol (float, optional): Stop when the standard error of the mean of the outputs in converge_on is
+                below rtol times the mean (or atol). Defaults to None (run max_samples).
+            min_samples (int, optional): Minimum number of samples before checking convergence.
+                Defaults to batch_size.
+            atol (float, optional): Absolute tolerance on the standard error of the mean, for outputs
+                whose mean is close to zero. Defaults to 0.
+            converge_on (tuple, optional): Names of the outputs checked for convergence, see converged().
+
+        Returns:
+            dict: Summary of the statistics, see summary().
+        """
+        if min_samples is None:
+            min_samples = batch_size
+        converge_on = self._converge_on(converge_on)
+        while self.n_samples < max_samples:
+            n = min(batch_size, max_samples - self.n_samples)
+            self._run_batch(n)
+            print(f"UQ: {self.n_samples} samples, {self.n_simulations} simulations")
+            if rtol is not None and self.n_samples >= min_samples and self.converged(rtol, atol, converge_on):
+                print(f"UQ: converged to rtol = {rtol} after {self.n_samples} samples")
+                break
+        return self.summary()
+
+    def summary(self):
+        """
+        Returns the current statistics of every output.
+
+        Returns:
+            dict: Mapping of output names to dictionaries with mean, std, standard_error, count, n_nan,
+            quantiles and, if sensitivity is enabled, first_order and total Sobol indices keyed by parameter name.
+        """
+        summary = {}
+        for name, s in self.stats.items():
+            summary[name] = {
+                'mean': s.mean if s.count else np.nan,
+                'std': np.sqrt(s.variance),
+                'standard_error': s.standard_error,
+                'count': s.count,
+                'n_nan': s.n_nan,
+                'quantiles': {p: q.value for p, q in self.quantiles[name].items()},
+            }
+            if self.sensitivity:
+                summary[name]['first_order'] = dict(zip(self.parameter_names, self.sobol[name].first_order))
+                summary[name]['total'] = dict(zip(self.parameter_names, self.sobol[name].total))
+        return summary
+
+
+class _RandomSampler:
+    """
+    Plain Monte Carlo sampler with the same interface as scipy.stats.qmc samplers.
+    """
+
+    def __init__(self, d, rng):
+        self.d = d
+        self.rng = rng
+
+    def random(self, n):
+        return self.rng.random((n, self.d))
@@ -0,0 +1,52 @@
+from openfc import BreedingBlanket, Component, ComponentMap, FuelingSystem, Plasma
+
+AF = 0.7
+N_burn = 9.3e-7 * AF
+fp_fw = 1e-4
+fp_div = 1e-4
+final_time = 0.05 * 3600 * 24 * 365
+
+
+def build_plant(TBE=0.02, f_dir=0.3, tau_bb=1.25 * 3600, tau_fc=3600, I_startup=1.1, TBR=1.073):
+    """
+    Builds a small closed fuel cycle: fueling system, plasma, fuel cleanup and breeding blanket.
+    """
+    fueling_system = FuelingSystem("Fueling System", N_burn, TBE, initial_inventory=I_startup)
+    BB = BreedingBlanket("BB", tau_bb, initial_inventory=0, N_burn=N_burn, TBR=TBR)
+    plasma = Plasma("Plasma", N_burn, TBE, fp_fw=fp_fw, fp_div=fp_div)
+    fuel_cleanup = Component("Fuel cleanup", tau_fc)
+    wall = Component("Wall", residence_time=1000)
+
+    fs_to_plasma = fueling_system.add_output_port("Fueling to Plasma")
+    plasma_in = plasma.add_input_port("Plasma in", incoming_fraction=1 - fp_fw - fp_div)
+    fs_to_wall = fueling_system.add_output_port("Fueling to Wall")
+    wall_in = wall.add_input_port("Wall in", incoming_fraction=fp_fw + fp_div)
+    plasma_out = plasma.add_output_port("Plasma out")
+    fc_in = fuel_cleanup.add_input_port("Fuel cleanup in", incoming_fraction=1 - f_dir)
+    fs_direct = fueling_system.add_input_port("Direct in", incoming_fraction=f_dir)
+    plasma_direct = plasma.add_output_port("Plasma direct")
+    fc_out = fuel_cleanup.add_output_port("Fuel cleanup out")
+    fs_from_fc = fueling_system.add_input_port("From fuel cleanup")
+    wall_out = wall.add_output_port("Wall out")
+    bb_from_wall = BB.add_input_port("From wall")
+    bb_out = BB.add_output_port("BB out")
+    fs_from_bb = fueling_system.add_input_port("From BB")
+
+    component_map = ComponentMap()
+    for component in (fueling_system, BB, plasma, fuel_cleanup, wall):
+        component_map.add_component(component)
+    component_map.connect_ports(fueling_system, fs_to_plasma, plasma, plasma_in)
+    component_map.connect_ports(fueling_system, fs_to_wall, wall, wall_in)
+    component_map.connect_ports(plasma, plasma_out, fuel_cleanup, fc_in)
+    component_map.connect_ports(plasma, plasma_direct, fueling_system, fs_direct)
+    component_map.connect_ports(fuel_cleanup, fc_out, fueling_system, fs_from_fc)
+    component_map.connect_ports(wall, wall_out, BB, bb_from_wall)
+    component_map.connect_ports(BB, bb_out, fueling_system, fs_from_bb)
+    return component_map
+
+
+def simulate_kwargs(**params):
+    """
+    Simulate arguments for the small plant: a short run with a low target doubling time.
+    """
+    return dict(dt=0.01, dt_max=1000, final_time=final_time, I_reserve=0.1, max_simulations=3, target_doubling_time=0.04)
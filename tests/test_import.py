@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def _import_openfc(statement='import openfc'):
+    code = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    return set(json.loads(output.stdout.strip().splitlines()[-1]))
+
+
+def test_import_does_not_load_heavy_dependencies():
+    modules = _import_openfc()
+    for heavy in ('scipy', 'matplotlib', 'networkx'):
+        assert heavy not in modules
+
+
+def test_lazy_attributes_load_on_access():
+    modules = _import_openfc('import openfc\nopenfc.Surrogate')
+    assert 'openfc.surrogate' in modules
+    assert 'matplotlib' not in modules
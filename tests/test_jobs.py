@@ -0,0 +1,71 @@
+from openfc.jobs import DONE, FAILED, PENDING, RUNNING, JobStore, run_local, run_worker
+from tests.plants import build_plant, simulate_kwargs
+
+CASES = [{'TBE': TBE, 'f_dir': f_dir} for TBE in (0.02, 0.03) for f_dir in (0.3, 0.5)]
+
+
+def test_run_local_completes_every_case_once(tmp_path):
+    path = str(tmp_path / 'sweep.db')
+    store = JobStore(path)
+    assert store.add_cases(CASES) == len(CASES)
+    completed = run_local(path, build_plant, simulate_kwargs, n_workers=3, batch_size=1)
+    assert completed == len(CASES)
+    assert store.counts() == {PENDING: 0, RUNNING: 0, DONE: len(CASES), FAILED: 0}
+    assert store.connection.execute("SELECT MAX(attempts) FROM cases").fetchone()[0] == 1
+    results = store.results()
+    assert sorted((params['TBE'], params['f_dir']) for params, _ in results) == sorted((c['TBE'], c['f_dir']) for c in CASES)
+    assert all(result['I_startup'] > 0 for _, result in results)
+    # Adding the same cases again is a no-op, and no worker has anything left to do
+    assert store.add_cases(CASES) == 0
+    assert run_local(path, build_plant, simulate_kwargs, n_workers=2) == 0
+    store.close()
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    store = JobStore(str(tmp_path / 'sweep.db'))
+    store.add_cases(CASES[:1])
+    [(case, _)] = store.claim(1, 'dead worker', lease=3600)
+    assert store.claim(1, 'other worker', lease=3600) == []
+    assert [c for c, _ in store.claim(1, 'other worker', lease=-1)] == [case]
+    assert store.connection.execute("SELECT attempts FROM cases").fetchone()[0] == 2
+    store.close()
+
+
+def test_stale_worker_cannot_overwrite(tmp_path):
+    store = JobStore(str(tmp_path / 'sweep.db'))
+    store.add_cases(CASES[:1])
+    [(case, _)] = store.claim(1, 'slow worker')
+    store.claim(1, 'fast worker', lease=-1)
+    assert store.complete(case, {'I_startup': 1.0}, 'fast worker')
+    # The slow worker finishes after its lease expired: the case must stay done
+    assert not store.fail(case, 'error', 'slow worker')
+    assert not store.complete(case, {'I_startup': 2.0}, 'slow worker')
+    assert not store.fail(case, 'error', 'fast worker')
+    assert store.counts()[DONE] == 1
+    assert store.results() == [(CASES[0], {'I_startup': 1.0})]
+    store.close()
+
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / 'sweep.db')
+    store = JobStore(path)
+    store.add_cases(CASES)
+    store.claim(2, 'crashed-host:123')
+    # A new worker cannot claim the cases of the dead one until its lease expires
+    assert run_worker(path, build_plant, simulate_kwargs, worker='new-host:456') == 2
+    assert store.counts()[RUNNING] == 2
+    assert store.release('other-host:789') == 0
+    assert store.release('crashed-host:123') == 2
+    assert run_worker(path, build_plant, simulate_kwargs) == 2
+    assert store.counts() == {PENDING: 0, RUNNING: 0, DONE: len(CASES), FAILED: 0}
+    store.close()
+
+
+def test_run_local_resume(tmp_path):
+    path = str(tmp_path / 'sweep.db')
+    store = JobStore(path)
+    store.add_cases(CASES[:2])
+    store.claim(1, 'crashed-host:123')
+    assert run_local(path, build_plant, simulate_kwargs, n_workers=2, resume=True) == 2
+    assert store.counts()[DONE] == 2
+    store.close()
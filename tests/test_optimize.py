@@ -0,0 +1,59 @@
+import functools
+
+import numpy as np
+import pytest
+
+from openfc import Simulate
+from openfc.optimize import DesignOptimizer
+from openfc.tools.evaluation import evaluate_design
+from tests.plants import build_plant, simulate_kwargs
+
+# High TBR so that every design doubles within the short test run, low startup inventory so that
+# Simulate has to raise it for some designs
+build_breeding_plant = functools.partial(build_plant, TBR=3.0, I_startup=0.2)
+BOUNDS = {'TBE': (0.01, 0.03), 'f_dir': (0.1, 0.6)}
+
+
+def test_required_inventory_depends_on_design():
+    optimizer = DesignOptimizer(build_breeding_plant, BOUNDS, simulate_kwargs)
+    low_TBE, high_TBE = optimizer.evaluate([0.01, 0.3]), optimizer.evaluate([0.03, 0.3])
+    low_f_dir, high_f_dir = optimizer.evaluate([0.02, 0.1]), optimizer.evaluate([0.02, 0.6])
+    # Simulate.run never lowers I_startup, so it is flat where the reserve is met
+    assert high_TBE['I_startup'] == low_f_dir['I_startup'] == high_f_dir['I_startup'] == 0.2
+    assert high_TBE['I_required'] < low_TBE['I_required']
+    assert high_f_dir['I_required'] < low_f_dir['I_required']
+
+
+def test_evaluations_are_cached():
+    optimizer = DesignOptimizer(build_breeding_plant, BOUNDS, simulate_kwargs)
+    optimizer.evaluate_many([[0.02, 0.3], [0.02, 0.3]])
+    optimizer.constraints([0.02, 0.3])
+    optimizer.penalized_objective([0.02, 0.3])
+    assert optimizer.n_simulations == 1
+
+
+def test_optimum_moves_to_high_TBE_and_f_dir():
+    optimizer = DesignOptimizer(build_breeding_plant, BOUNDS, simulate_kwargs)
+    result = optimizer.minimize(options={'maxiter': 20})
+    center = optimizer.evaluate([0.02, 0.35])
+    assert result.feasible
+    assert result.outputs['I_required'] < center['I_required']
+    assert result.params['TBE'] > 0.025
+    assert result.params['f_dir'] > 0.45
+    assert optimizer.n_simulations == len(optimizer.cache)
+
+
+def test_doubling_margin_describes_the_required_inventory():
+    optimizer = DesignOptimizer(build_breeding_plant, BOUNDS, simulate_kwargs)
+    result = optimizer.minimize(options={'maxiter': 10})
+    # Simulate the returned design directly at the required startup inventory
+    simulation = Simulate(component_map=build_plant(TBR=result.outputs['TBR'], I_startup=result.outputs['I_required'],
+                                                    **result.params),
+                          **dict(simulate_kwargs(), max_simulations=1))
+    simulation.run()
+    assert np.min(np.array(simulation.y)[:, 0]) == pytest.approx(simulation.I_reserve, abs=1e-3)
+    assert result.outputs['doubling_margin'] == pytest.approx(
+        simulation.target_doubling_time - simulation.doubling_time, abs=1e-6)
+    # The doubling time at the startup inventory set by the builder is a different design
+    builder_doubling_time = evaluate_design(build_breeding_plant, result.params, simulate_kwargs)['doubling_time']
+    assert builder_doubling_time > simulation.doubling_time + 1e-3
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from openfc import Component, ComponentMap, Simulate
+from tests.plants import build_plant, simulate_kwargs
+
+
+@pytest.fixture(scope='module')
+def simulation():
+    simulation = Simulate(component_map=build_plant(), store_flows=True, ledger=True, **simulate_kwargs())
+    simulation.run()
+    return simulation
+
+
+def test_flows_match_stored_flows(simulation):
+    results = simulation.results()
+    n = len(results)
+    assert n == len(simulation.time)
+    for name, component in simulation.components.items():
+        # Stored flows are appended over every pass of run(): the last n belong to the final pass.
+        # restart() does not refresh the port flow rates, so the first stored step still holds
+        # the flows at the end of the previous pass.
+        np.testing.assert_allclose(results.inflow(name)[1:], component.inflow[-n + 1:], rtol=1e-12, atol=1e-20)
+        np.testing.assert_allclose(results.outflow(name)[1:], component.outflow[-n + 1:], rtol=1e-12, atol=1e-20)
+
+
+def test_flows_are_not_stored_by_default():
+    simulation = Simulate(component_map=build_plant(), **simulate_kwargs())
+    simulation.run()
+    assert all(component.inflow == component.outflow == [] for component in simulation.components.values())
+    assert np.all(simulation.results().outflow('Plasma') > 0)
+
+
+def test_inventories_and_port_access(simulation):
+    results = simulation.results()
+    np.testing.assert_array_equal(results['Fueling System'], np.array(simulation.y)[:, 0])
+    np.testing.assert_array_equal(results['Plasma out'], results[('Plasma', 'Plasma out')])
+    with pytest.raises(KeyError):
+        results['Not a port']
+
+
+def test_slice_and_resample(simulation):
+    results = simulation.results()
+    sliced = results.slice(1e5, 2e5)
+    assert sliced.time[0] >= 1e5 and sliced.time[-1] <= 2e5
+    np.testing.assert_array_equal(sliced['BB'], results['BB'][(results.time >= 1e5) & (results.time <= 2e5)])
+    times = np.linspace(0, results.time[-1], 11)
+    resampled = results.resample(times)
+    np.testing.assert_allclose(resampled['BB'], np.interp(times, results.time, results['BB']))
+
+
+def test_reductions_match_ledger(simulation):
+    results = simulation.results()
+    ledger = simulation.mass_balance
+    # The ledger also includes the last step past the final time
+    assert results.burned_total() == pytest.approx(ledger['burned'], rel=1e-3)
+    assert results.bred_total() == pytest.approx(ledger['bred'], rel=1e-3)
+    assert sum(results.decay_totals().values()) == pytest.approx(ledger['decayed'], rel=1e-3)
+    assert sum(results.cumulative_losses().values()) == pytest.approx(ledger['lost'], rel=1e-3)
+    above = results.time_above_reserve()
+    assert 0 < above <= results.time[-1]
+
+
+def test_ports_with_the_same_name_on_different_components():
+    A = Component("A", residence_time=10, initial_inventory=1.0)
+    B = Component("B", residence_time=10, initial_inventory=0.5)
+    a_out, a_in = A.add_output_port("out"), A.add_input_port("in")
+    b_out, b_in = B.add_output_port("out"), B.add_input_port("in")
+    component_map = ComponentMap()
+    component_map.add_component(A)
+    component_map.add_component(B)
+    component_map.connect_ports(A, a_out, B, b_in)
+    component_map.connect_ports(B, b_out, A, a_in)
+
+    from openfc import Results
+    results = Results([0.0], [[1.0, 0.5]], component_map)
+    assert results.inflow('A')[0] == pytest.approx(0.05)
+    assert results.inflow('B')[0] == pytest.approx(0.1)
+    assert results[('A', 'out')][0] == pytest.approx(0.1)
+    with pytest.raises(KeyError):
+        results['out']
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from openfc import Crossing, Downsample, Maximum, Minimum, Simulate
+from tests.plants import build_plant, simulate_kwargs
+
+
+def make_reducers(threshold):
+    return [Minimum('Fueling System'), Maximum(), Crossing(threshold, 'Fueling System', direction='down'),
+            Crossing(threshold, 'Fueling System'), Downsample(3600.0, 'BB')]
+
+
+def test_run_streaming_matches_run():
+    # Low startup inventory and TBR, so that both the inventory and the TBR iterations are exercised
+    kwargs = dict(simulate_kwargs(), max_simulations=10, TBRr_accuraty=0.05)
+    simulation = Simulate(component_map=build_plant(I_startup=0.05, TBR=1.2), **kwargs)
+    simulation.run()
+    streaming = Simulate(component_map=build_plant(I_startup=0.05, TBR=1.2), **kwargs)
+    streaming.run_streaming(chunk_size=64)
+    assert simulation.simulation_count > 2
+    assert streaming.simulation_count == simulation.simulation_count
+    assert streaming.I_startup == pytest.approx(simulation.I_startup, rel=1e-12)
+    assert streaming.components['BB'].TBR == pytest.approx(simulation.components['BB'].TBR, rel=1e-12)
+    assert np.isfinite(simulation.doubling_time)
+    assert streaming.doubling_time == pytest.approx(simulation.doubling_time, rel=1e-12)
+
+
+def test_reducers_across_chunk_boundaries():
+    simulation = Simulate(component_map=build_plant(), **simulate_kwargs())
+    # The Fueling System inventory drops from 1.1 kg to about 1.02 kg and then recovers
+    threshold = 1.05
+    chunked = make_reducers(threshold)
+    chunks = list(simulation.stream(7, chunked))
+    assert len(chunks) > 2
+    t = np.concatenate([t for t, _ in chunks])
+    y = np.concatenate([y for _, y in chunks])
+    # The same reducers updated with the whole run at once
+    whole = make_reducers(threshold)
+    for reducer in whole:
+        reducer.bind(list(simulation.components.keys()))
+        reducer.update(t, y)
+    minimum, maximum, down, up, downsample = chunked
+    assert minimum.value == np.min(y[:, 0])
+    assert minimum.time == t[np.argmin(y[:, 0])]
+    np.testing.assert_array_equal(maximum.value, np.max(y, axis=0))
+    np.testing.assert_array_equal(maximum.time, t[np.argmax(y, axis=0)])
+    assert down.count > 0 and up.count > 1
+    for a, b in zip(chunked[2:4], whole[2:4]):
+        assert (a.first, a.count, a.times) == (b.first, b.count, b.times)
+    for a, b in zip(downsample.result, whole[4].result):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_crossing_on_chunk_boundaries():
+    t = np.arange(12.0)
+    y = np.array([0, 2, 0, 0, 2, 2, 0, 2, 2, 2, 0, 2], dtype=float)[:, None]
+    expected = [1.0, 4.0, 7.0, 11.0]
+    for chunk_size in (1, 2, 3, 4, 12):
+        crossing = Crossing(1.0, 'A', max_crossings=3)
+        crossing.bind(['A'])
+        for start in range(0, len(t), chunk_size):
+            crossing.update(t[start:start + chunk_size], y[start:start + chunk_size])
+        assert crossing.first == expected[0]
+        assert crossing.count == len(expected)
+        assert crossing.times == expected[:3]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from openfc.surrogate import GaussianProcess, Surrogate
+from tests.plants import build_plant, simulate_kwargs
+
+
+def _function(X):
+    return np.sin(3 * X[:, 0]) + X[:, 1]**2
+
+
+def test_gaussian_process_loo_error_matches_held_out_error():
+    rng = np.random.default_rng(0)
+    X, X_test = rng.random((30, 2)), rng.random((500, 2))
+    gp = GaussianProcess(seed=0).fit(X, _function(X))
+    mean, std = gp.predict(X_test, return_std=True)
+    held_out = np.sqrt(np.mean((mean - _function(X_test))**2))
+    assert held_out < 0.01
+    # Leave-one-out drops points at the edges of the design, so it is pessimistic but of the same order
+    assert held_out / 5 < gp.loo_error() < 5 * held_out
+    # The predictive standard deviation bounds most of the errors
+    assert np.mean(np.abs(mean - _function(X_test)) <= 3 * std) > 0.9
+
+
+def test_surrogate_from_sweep_results():
+    rng = np.random.default_rng(1)
+    X = 10 + 10 * rng.random((40, 2))
+    surrogate = Surrogate({'a': (10, 20), 'b': (10, 20)}, outputs={'f': None}, seed=0)
+    surrogate.add_samples(X, {'f': _function((X - 10) / 10)})
+    surrogate.fit()
+    prediction, std = surrogate.predict({'a': 15, 'b': 12}, return_std=True)['f']
+    assert prediction == pytest.approx(np.sin(1.5) + 0.04, abs=1e-2)
+    assert std < 1e-2
+
+
+def test_refine_candidates_do_not_repeat_training_points():
+    surrogate = Surrogate({'a': (0, 1), 'b': (0, 1)}, seed=0)
+    training = surrogate._sample(8)
+    candidates = surrogate._sample(64)
+    assert not any(np.any(np.all(np.isclose(candidates, point), axis=1)) for point in training)
+
+
+def test_train_and_refine_on_plant():
+    surrogate = Surrogate({'TBE': (0.015, 0.025)}, seed=0)
+    surrogate.train(build_plant, simulate_kwargs, n_samples=4)
+    surrogate.refine(build_plant, simulate_kwargs, tol=0, max_simulations=2, batch_size=2, n_candidates=64)
+    assert len(surrogate.X) == 6
+    assert len(set(surrogate.X[:, 0])) == 6
+    prediction = surrogate.predict({'TBE': 0.02})
+    assert prediction['I_startup'] > 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from openfc.uncertainty import P2Quantile, RunningStats, SobolAccumulator, UncertaintyQuantification
+from tests.plants import build_plant, simulate_kwargs
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(3.0, 2.0, size=1000)
+    s = RunningStats()
+    for value in values:
+        s.update(value)
+    s.update(np.nan)
+    assert s.count == 1000
+    assert s.n_nan == 1
+    assert s.mean == pytest.approx(np.mean(values))
+    assert s.variance == pytest.approx(np.var(values, ddof=1))
+
+
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+def test_p2_quantile_matches_numpy(p):
+    values = np.random.default_rng(1).normal(size=20000)
+    q = P2Quantile(p)
+    for value in values:
+        q.update(value)
+    assert q.value == pytest.approx(np.quantile(values, p), abs=0.02)
+
+
+def test_p2_quantile_of_integers():
+    values = np.random.default_rng(3).integers(0, 1000, size=2000)
+    q_int, q_float = P2Quantile(0.5), P2Quantile(0.5)
+    for value in values:
+        q_int.update(value)
+        q_float.update(float(value))
+    assert q_int.value == q_float.value
+    assert q_int.value != round(q_int.value)
+
+
+@pytest.mark.parametrize("offset", [0.0, 1000.0])
+def test_sobol_indices_of_linear_function(offset):
+    # f = c + x1 + 0.3 x2 with uniform inputs: S1 = ST = (1, 0.09) / 1.09 whatever the offset c
+    f = lambda x: offset + x[:, 0] + 0.3 * x[:, 1]
+    # Plain Monte Carlo: Sobol points are balanced enough to hide an uncentered estimator
+    u = np.random.default_rng(2).random((8192, 4))
+    A, B = u[:, :2], u[:, 2:]
+    AB = [A.copy() for _ in range(2)]
+    for i in range(2):
+        AB[i][:, i] = B[:, i]
+    f_A, f_B = f(A), f(B)
+    f_AB = np.column_stack([f(ab) for ab in AB])
+    accumulator = SobolAccumulator(2)
+    for row in range(len(A)):
+        accumulator.update(f_A[row], f_B[row], f_AB[row])
+    expected = np.array([1.0, 0.09]) / 1.09
+    np.testing.assert_allclose(accumulator.first_order, expected, atol=0.03)
+    np.testing.assert_allclose(accumulator.total, expected, atol=0.03)
+
+
+def test_uncertainty_quantification_on_plant():
+    uq = UncertaintyQuantification(build_plant, {'TBE': stats.uniform(0.015, 0.01)}, simulate_kwargs,
+                                   quantiles=(0.5,), seed=0)
+    summary = uq.run(max_samples=4, batch_size=4)
+    assert uq.n_samples == 4
+    assert summary['I_startup']['count'] == 4
+    assert summary['I_startup']['mean'] > 0
+    assert np.isfinite(summary['TBR']['quantiles'][0.5])
+
+
+def test_convergence_skips_residuals_and_missing_outputs():
+    uq = UncertaintyQuantification(build_plant, {'TBE': stats.uniform(0.015, 0.01)}, simulate_kwargs)
+    rng = np.random.default_rng(4)
+    for _ in range(100):
+        # Startup inventory within 0.1%, reserve margin at the iteration residual, doubling never reached
+        uq._update({'I_startup': 1.0 + 0.01 * rng.normal(), 'doubling_time': np.nan, 'TBR': 1.1,
+                    'reserve_margin': 1e-6 * rng.normal()})
+    assert uq.converged(0.01)
+    assert not uq.converged(0.01, converge_on=('reserve_margin',))
+    assert uq.converged(0.01, atol=1e-5, converge_on=('reserve_margin',))
+    assert not uq.converged(0.01, converge_on=('doubling_time',))
+    with pytest.raises(ValueError):
+        uq.converged(0.01, converge_on=('I_required',))